@@ -1,102 +1,254 @@
+from __future__ import annotations
+
 import ast
 import os
 import sys
-import re
-import collections
-import f
-
-
-from typing import NamedTuple as named_tuple
+import hashlib
+import concurrent.futures
+
+(PYTHON_MAJOR, PYTHON_MINOR, LINE_WIDTH, SET_DUPLICATE, IMPORT_SPREAD,
+ IMPORT_MULTIPLE, ARG_NAME, VAR_NAME, FUNC_NAME_LENGTH, FUNC_NAME,
+ CLASS_NAME, ALIAS_NAME, UNUSED_VARIABLE) = range(13)
+
+MESSAGES = {
+  PYTHON_MAJOR: (
+    'Parts of this linter may not work without Python 3',
+    None
+  ),
+  PYTHON_MINOR: (
+    'Parts of this linter may not work without a modern Python',
+    None
+  ),
+  LINE_WIDTH: (
+    'Line width exceeds 80 characters',
+    'You may not have a line of code longer than 80 characters.'
+  ),
+  SET_DUPLICATE: (
+    'Set contains duplicate elements',
+    'Set may not explicitly be defined with duplicate elements'
+  ),
+  IMPORT_SPREAD: (
+    'Import statements are spread out too much',
+    'Declare imports at the top of every file'
+  ),
+  IMPORT_MULTIPLE: (
+    'Import more than one module on a single line',
+    'Have only one import per line'
+  ),
+  ARG_NAME: (
+    'Function arguments do not follow PEP8 Standards',
+    'Review PEP8 style for argument definition'
+  ),
+  VAR_NAME: (
+    'Variable does not follow PEP8 Standards',
+    'Review PEP8 style for for variable definition'
+  ),
+  FUNC_NAME_LENGTH: (
+    'Function name must be at least two characters long',
+    'Review PEP8 style for function definition'
+  ),
+  FUNC_NAME: (
+    'Function name does not follow PEP8 Standards',
+    'Review PEP8 style for function definition'
+  ),
+  CLASS_NAME: (
+    'Class name does not follow PEP8 Standards',
+    'Review PEP8 style for class definition'
+  ),
+  ALIAS_NAME: (
+    'Alias name does not follow PEP8 Standards',
+    'Review PEP8 style for module importing'
+  ),
+  UNUSED_VARIABLE: (
+    'Unused variable',
+    'Your previously defined variable has not been used'
+  )
+}
+
+class LintException:
+  __slots__ = ('code', 'line', 'txt')
+
+  def __init__(self, code: int, line: int | None = None,
+               txt: str | None = None):
+    self.code = code
+    self.line = line
+    self.txt = txt
+
+  def __repr__(self):
+    return 'LintException(code=%r, line=%r, txt=%r)' % \
+        (self.code, self.line, self.txt)
+
+class Rule:
+  def __init__(self):
+    self.exceptions = []
+    self._seen = set()
 
-class Exception(named_tuple):
-  line: int
-  txt: str
-  msg: str
-  expl: str
+  def add(self, exception):
+    key = (exception.code, exception.line, exception.txt)
+    if key not in self._seen:
+      self._seen.add(key)
+      self.exceptions.append(exception)
 
-class Rule(ast.NodeVisitor):
-  def __init__(self):
-    self.exceptions = set()
+def _lint_one(source_path, rule_types):
+  linter = Linter()
+  linter.rule_types = list(rule_types)
+  return linter.collect(source_path)
+
+class CompositeVisitor:
+  def __init__(self, rules):
+    self.hooks = dict()
+    for rule in rules:
+      for name in dir(type(rule)):
+        if name.startswith('visit_'):
+          node_type = getattr(ast, name[len('visit_'):])
+          self.hooks.setdefault(node_type, []).append(getattr(rule, name))
+
+  def visit(self, tree):
+    hooks = self.hooks
+    stack = [tree]
+    while stack:
+      node = stack.pop()
+      for hook in hooks.get(type(node), ()):
+        hook(node)
+
+      stack.extend(reversed(list(ast.iter_child_nodes(node))))
 
 class Linter:
   def __init__(self):
-    self.rules = [Sets()]
-    self.internal = Rule()
+    self.rule_types = [Sets]
+    self.results = dict()
+    self.max_results = 256
   
   @staticmethod
-  def print_exception(file_name, rule=None):
-    for line, txt, msg, expl in rule.exceptions:
-      print('******************************')
-      if(file_name): print('  File:     %s' % file_name)
-      if     (line): print('  Line:     %d' % line)
-      if      (txt): print('  Code:     %s' % txt)
-      if      (msg): print('  Message:  %s' % msg)
-      if     (expl): print('  Hint:     %s' % expl)
+  def print_exception(file_name, exceptions):
+    out = list()
+    for exception in exceptions:
+      line, txt = exception.line, exception.txt
+      msg, expl = MESSAGES[exception.code]
+      out.append('******************************')
+      if(file_name): out.append(f'  File:     {file_name}')
+      if     (line): out.append(f'  Line:     {line}')
+      if      (txt): out.append(f'  Code:     {txt}')
+      if      (msg): out.append(f'  Message:  {msg}')
+      if     (expl): out.append(f'  Hint:     {expl}')
+
+    if out:
+      sys.stdout.write('\n'.join(out) + '\n')
 
   def lint_version(self, file_name):
     major, minor = sys.version_info[:2]
     if(major < 3):
-      exception = Exception(
-                    msg='Parts of this linter may not work without Python 3',
+      exception = LintException(
+                    code=PYTHON_MAJOR,
                     txt='Consider upgrading to Python 3.'
       )
 
-      self.internal.exceptions.add(exception)
+      self.internal.add(exception)
 
     if(minor < 9):
-      exception = Exception(
-                    msg='Parts of this linter may not work without a modern Python',
+      exception = LintException(
+                    code=PYTHON_MINOR,
                     txt='Consider upgrading to Python 3.9.'
       )
 
-      self.internal.exceptions.add(exception)
+      self.internal.add(exception)
 
-  def lint_lines(self, file_name):
-    with open(file_name, mode='rt', encoding='utf-8') as f:
-      no = 1
-      for line in f.readlines():
+  def lint_lines_bytes(self, data, file_name):
+    for no, line in enumerate(data.split(b'\n'), 1):
+      if(79 < len(line)):
+        line = line.decode('utf-8').rstrip('\r')
         if(79 < len(line)):
-          exception = Exception(
+          exception = LintException(
+                        code=LINE_WIDTH,
                         line=no,
-                        txt=line[:60].strip() + '...',
-                        msg='Line width exceeds 80 characters',
-                        expl='You may not have a line of code longer than 80 characters.'
+                        txt=line[:60].strip() + '...'
           )
 
-          self.internal.exceptions.add(exception)
+          self.internal.add(exception)
+
+  def lint(self, data, file_name):
+    self.rules = [rule_type() for rule_type in self.rule_types]
+    self.internal = Rule()
+
+    self.lint_version(file_name)
+    self.lint_lines_bytes(data, file_name)
+
+    self.rules.append(self.internal)
+
+    tree = ast.parse(data, filename=file_name, type_comments=False)
+
+    CompositeVisitor(self.rules).visit(tree)
 
-        no += 1
+    return [rule.exceptions for rule in self.rules]
+
+  def collect(self, source_path):
+    with open(source_path, 'rb') as source_file:
+      data = source_file.read()
+
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    key = (digest, tuple(self.rule_types))
+    if key not in self.results:
+      while self.max_results <= len(self.results):
+        del self.results[next(iter(self.results))]
+
+      file_name = os.path.basename(source_path)
+      self.results[key] = self.lint(data, file_name)
+
+    return self.results[key]
 
   def run(self, source_path):
     file_name = os.path.basename(source_path)
 
-    self.lint_version(file_name)
-    self.lint_lines(file_name)
+    for exceptions in self.collect(source_path):
+      self.print_exception(file_name, exceptions)
+
+  def run_many(self, source_paths):
+    source_paths = list(source_paths)
+    failed = list()
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+      rule_types = tuple(self.rule_types)
+      futures = [executor.submit(_lint_one, path, rule_types)
+                 for path in source_paths]
+
+      for source_path, future in zip(source_paths, futures):
+        file_name = os.path.basename(source_path)
+        try:
+          result = future.result()
+        except Exception as error:
+          sys.stdout.flush()
+          sys.stderr.write(f'{source_path}: {type(error).__name__}: {error}\n')
+          failed.append(source_path)
+          continue
 
-    self.rules.append(self.internal)    
+        for exceptions in result:
+          self.print_exception(file_name, exceptions)
 
-    with open(source_path) as source_file:
-      source_code = source_file.read()
-    
-    tree = ast.parse(source_code)
-    
-    for rule in self.rules:
-      rule.visit(tree)
-      self.print_exception(file_name, rule=rule)
+    return failed
 
 class Sets(Rule):
   def visit_Set(self, node):
-    res = list()
-    f.extract(node.elts, res)
-    result = ''.join(res); final = ''.join(f.delimit(result))
-    if len(node.elts) != len(ast.literal_eval(final)):
-      exception = Exception(
-                    line=node.lineno,
-                    txt=f'{final}',
-                    msg='Set contains duplicate elements',
-                    expl='Set may not explicitly be defined with duplicate elements'
-      )
-      self.exceptions.add(exception)
+    seen = set()
+    for elem in node.elts:
+      try:
+        value = ast.literal_eval(elem)
+        hash(value)
+      except (ValueError, TypeError):
+        continue
+
+      if value in seen:
+        break
+
+      seen.add(value)
+    else:
+      return
+
+    exception = LintException(
+                  code=SET_DUPLICATE,
+                  line=node.lineno,
+                  txt=ast.unparse(node)
+    )
+
+    self.add(exception)
 
 class Imports(Rule):
   def __init__(self):
@@ -109,47 +261,43 @@ class Imports(Rule):
 
     if self.index < node.lineno:
       if 3 < (node.lineno - self.index):
-        exception = Exception(
+        exception = LintException(
+                      code=IMPORT_SPREAD,
                       line=None,
-                      txt=None,
-                      msg='Import statements are spread out too much',
-                      expl='Declare imports at the top of every file'
+                      txt=None
         )
 
-        self.exceptions.add(exception)
+        self.add(exception)
 
     self.index = node.lineno
 
     if 1 < len(packages):
       error = ', '.join([package.name for package in packages])
-      exception = Exception(
+      exception = LintException(
+                      code=IMPORT_MULTIPLE,
                       line=node.lineno,
-                      txt=f'import {error}',
-                      msg='Import more than one module on a single line',
-                      expl='Have only one import per line'
+                      txt=f'import {error}'
       )
 
-      self.exceptions.add(exception)
+      self.add(exception)
 
 class Naming(Rule):
   def __init__(self):
-    self.VAR_STYLE = '[A-Z]|[@!#$%^&*()<>?/\|}{~:]'
-    self.FUNC_STYLE = '[A-Z]|[@!#$%^&*()<>?/\|}{~:]'
-    self.CLASS_STYLE = '[0-9]|[@_!#$%^&*()<>?/\|}{~:]'
-    self.PACKAGE_STYLE = '[A-Z]|[0-9]|[@_!#$%^&*()<>?/\|}{~:]'
-
     self.default_expression = '{variable}={value}'
 
     super().__init__()
 
   def lint_args(self, node):
     arguments = node.args.args
+    if not arguments:
+      return
+
+    defaults = node.args.defaults
+    offset = len(arguments) - len(defaults)
+
     for arg in arguments:
       argument = arg.arg
-      if re.search(self.VAR_STYLE, argument):
-        defaults = node.args.defaults
-        offset = len(arguments) - len(defaults)
-
+      if argument != argument.lower():
         text = list()
         for index in range(len(arguments)):
           if index < offset:
@@ -163,142 +311,119 @@ class Naming(Rule):
 
         statement = ', '.join(text)
 
-        exception = Exception(
+        exception = LintException(
+                      code=ARG_NAME,
                       line=node.lineno,
-                      txt=f'{node.name}({statement})',
-                      msg='Function arguments do not follow PEP8 Standards',
-                      expl='Review PEP8 style for argument definition'
+                      txt=f'{node.name}({statement})'
         )
 
-        self.exceptions.add(exception)
+        self.add(exception)
         break
 
   def visit_Name(self, node):
     if isinstance(node.ctx, ast.Store):
       name = node.id
-      if re.search(self.VAR_STYLE, name):
-        exception = Exception(
+      if name != name.lower():
+        exception = LintException(
+                      code=VAR_NAME,
                       line=node.lineno,
-                      txt=name,
-                      msg='Variable does not follow PEP8 Standards',
-                      expl='Review PEP8 style for for variable definition'
+                      txt=name
         )
 
-        self.exceptions.add(exception)
-
-    super().generic_visit(node)
+        self.add(exception)
   
   def visit_FunctionDef(self, node):
     name = node.name
     self.lint_args(node)
     if len(name) == 1:
-      exception = Exception(
+      exception = LintException(
+                    code=FUNC_NAME_LENGTH,
                     line=node.lineno,
-                    txt=f'{name}()',
-                    msg='Function name must be at least two characters long',
-                    expl='Review PEP8 style for function definition'
+                    txt=f'{name}()'
       )
       
-      self.exceptions.add(exception)
+      self.add(exception)
 
-    if re.search(self.FUNC_STYLE, name):
-      exception = Exception(
+    if name != name.lower():
+      exception = LintException(
+                    code=FUNC_NAME,
                     line=node.lineno,
-                    txt=f'{name}()',
-                    msg='Function name does not follow PEP8 Standards',
-                    expl='Review PEP8 style for function definition'
+                    txt=f'{name}()'
       )
 
-      self.exceptions.add(exception)
-
-    super().generic_visit(node)
+      self.add(exception)
   
   def visit_ClassDef(self, node):
     name = node.name
-    if len(name) < 2 or re.search(self.CLASS_STYLE, name):
-      exception = Exception(
+    if len(name) < 2 or not name.isalpha():
+      exception = LintException(
+                    code=CLASS_NAME,
                     line=node.lineno,
-                    txt=f'class {name}()',
-                    msg='Class name does not follow PEP8 Standards',
-                    expl='Review PEP8 style for class definition'
+                    txt=f'class {name}()'
       )
 
-      self.exceptions.add(exception)
-
-    super().generic_visit(node)
+      self.add(exception)
   
   def visit_Import(self, node):
     packages = node.names
     if len(packages) == 1:
       alias = packages[0].asname
       
-      if alias and re.search(self.PACKAGE_STYLE, alias):
-        exception = Exception(
+      if alias and not (alias.isalpha() and alias.islower()):
+        exception = LintException(
+                    code=ALIAS_NAME,
                     line=node.lineno,
-                    txt=f'import {alias}',
-                    msg='Alias name does not follow PEP8 Standards',
-                    expl='Review PEP8 style for module importing'
+                    txt=f'import {alias}'
         )
         
-        self.exceptions.add(exception)
-
-    super().generic_visit(node)
-
-class VariableScopeUsage(Rule):
-  def __init__(self):
-    self.unused = collections.Counter()
-    self.names = collections.Counter()
-
-    super().__init__()
-
-  def visit_Name(self, node):
-    name = node.id
-
-    if isinstance(node.ctx, ast.Store):
-      if name not in self.names:
-        self.names[name] = node
-      
-      if name not in self.unused:
-        self.unused[name] = True
-    else:
-      self.unused[name] = False
+        self.add(exception)
 
 class Variable(Rule):
-  def lint_variables(self, node):
-    visitor = VariableScopeUsage()
-    visitor.visit(node)
-
-    for name, unused in visitor.unused.items():
-      if unused:
-        node = visitor.names[name]
-        exception = Exception(
+  def lint_scope(self, stores, loads):
+    for name, node in stores.items():
+      if name not in loads:
+        exception = LintException(
+                      code=UNUSED_VARIABLE,
                       line=node.lineno,
-                      text=f'The variable {node} has not been used',
-                      msg='Unused variable',
-                      expl='Your previously defined variable has not been used'
+                      txt=f'The variable {name} has not been used'
         )
 
-        self.exceptions.add(exception)
-  
-  def visit_FunctionDef(self, node):
-    self.lint_variables(node)
-
-    super().generic_visit(node)
-
-  def visit_ClassDef(self, node):
-    self.lint_variables(node)
-
-    super().generic_visit(node)
-  
-  def visit_Module(self, node):
-    self.lint_variables(node)
-
-    super().generic_visit(node)
+        self.add(exception)
+
+  def visit_Module(self, module):
+    scopes = [(dict(), set())]
+    stack = [module]
+    while stack:
+      node = stack.pop()
+      if node is None:
+        stores, loads = scopes.pop()
+        self.lint_scope(stores, loads)
+        scopes[-1][1].update(loads)
+        continue
+
+      if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        scopes.append((dict(), set()))
+        stack.append(None)
+      elif isinstance(node, ast.Name):
+        stores, loads = scopes[-1]
+        if isinstance(node.ctx, ast.Store):
+          stores.setdefault(node.id, node)
+        else:
+          loads.add(node.id)
+
+      stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    self.lint_scope(*scopes[0])
 
 if __name__ == '__main__':
-  source_path = sys.argv[1]
+  source_paths = sys.argv[1:]
+  if not source_paths:
+    sys.exit('Usage: python linter.py <source_path> [<source_path> ...]')
 
   linter = Linter()
 
   print('Linting...')
-  linter.run(source_path)
\ No newline at end of file
+  if len(source_paths) == 1:
+    linter.run(source_paths[0])
+  elif linter.run_many(source_paths):
+    sys.exit(1)
\ No newline at end of file